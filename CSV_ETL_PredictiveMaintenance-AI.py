@@ -1,21 +1,348 @@
 import csv
 import io
+import itertools
+import os
 import re
-from typing import Dict, List, Tuple, Union, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Annotated, Dict, Iterable, Iterator, List, TextIO, Tuple, Union, Optional
 
-class PredictiveMaintenanceETL:
-    def __init__(self):
-        self.field_requirements = {
-            "machine_id": {"type": "string"},
-            "runtime_hours": {"type": "positive_integer"},
-            "vibration_level": {"type": "positive_number"},
-            "temperature": {"type": "range", "min": 0, "max": 200},
-            "maintenance_threshold": {"type": "range", "min": 0, "max": 100},
-            "max_operating_hours": {"type": "positive_integer"},
-            "scaling_factor": {"type": "positive_number"}
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; without it metrics fall back to per-row computation
+    np = None
+
+try:
+    import polars as pl
+except ImportError:
+    # Polars is optional; without it parsing falls back to csv.DictReader
+    pl = None
+
+try:
+    import msgspec
+except ImportError:
+    # msgspec is optional; without it rows are validated by the closure table
+    msgspec = None
+
+if msgspec is not None:
+    class MachineRow(msgspec.Struct):
+        """Typed CSV row; the constraints mirror field_requirements."""
+        machine_id: Annotated[str, msgspec.Meta(min_length=1)]
+        runtime_hours: Annotated[int, msgspec.Meta(gt=0)]
+        vibration_level: Annotated[float, msgspec.Meta(gt=0)]
+        temperature: Annotated[float, msgspec.Meta(ge=0, le=200)]
+        maintenance_threshold: Annotated[float, msgspec.Meta(ge=0, le=100)]
+        max_operating_hours: Annotated[int, msgspec.Meta(gt=0)]
+        scaling_factor: Annotated[float, msgspec.Meta(gt=0)]
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional; without it metrics use the NumPy vector path
+    njit = None
+
+try:
+    # Compiled metric kernel; build with `cythonize -i _fast_metrics.pyx`
+    from _fast_metrics import compute_metrics as _compute_metrics_ext
+except ImportError:
+    _compute_metrics_ext = None
+
+
+if np is not None and njit is not None:
+    # No fastmath: it rewrites rint(x * 100) / 100 into a reciprocal multiply
+    # and breaks the two-decimal rounding contract. No cache: the on-disk
+    # cache is keyed to the loader's module name, which is ad hoc for this
+    # hyphenated filename, and a stale entry raises instead of missing.
+    @njit(parallel=True)
+    def _metric_kernel(vib, sf, rt, mx, thr, pfr, mur, om, cs, eff, optimal):
+        """Compute all five metrics and the status mask in one fused loop."""
+        for i in prange(vib.shape[0]):
+            # Metrics are computed on the unrounded values and rounded once
+            # for output, as rint(x * 100) / 100 to stay inside nopython mode
+            p = vib[i] * sf[i]
+            m = p / rt[i] * 100.0
+            o = (mx[i] - rt[i]) / mx[i] * 100.0
+            c = o * 0.3 + (100.0 - m) * 0.7
+            e = rt[i] / p
+
+            m = np.rint(m * 100.0) / 100.0
+            c = np.rint(c * 100.0) / 100.0
+            e = np.rint(e * 100.0) / 100.0
+
+            pfr[i] = np.rint(p * 100.0) / 100.0
+            mur[i] = m
+            om[i] = np.rint(o * 100.0) / 100.0
+            cs[i] = c
+            eff[i] = e
+            optimal[i] = (c >= 75.0) and (0.90 <= e <= 9.90) and (m <= thr[i])
+else:
+    _metric_kernel = None
+
+# Rows above which the NumPy metric path is split across a process pool;
+# below it the pool startup costs more than it saves
+_PARALLEL_THRESHOLD = 50_000
+
+
+def _compute_metrics_numpy(stacked: Tuple) -> Tuple:
+    """Compute the metric buffer and optimal mask for one chunk of columns.
+
+    Module-level so a process pool can pickle it; rows are independent, so
+    chunks can be computed in any order and concatenated.
+    """
+    vib, sf, rt, mx, thr = stacked
+
+    # Compute all five metrics into one preallocated buffer
+    out = np.empty((5, vib.shape[0]))
+    out[0] = vib * sf
+    out[1] = out[0] / rt * 100
+    out[2] = (mx - rt) / mx * 100
+    out[3] = out[2] * 0.3 + (100 - out[1]) * 0.7
+    out[4] = rt / out[0]
+
+    # Fuse the five two-decimal round-offs into a single pass over the buffer
+    out *= 100
+    np.rint(out, out=out)
+    out /= 100
+
+    # Determine final recommendation via boolean masks
+    optimal = (out[3] >= 75) & (out[4] >= 0.90) & (out[4] <= 9.90) & (out[1] <= thr)
+
+    return out, optimal
+
+
+# Immutable schema state, built once at import instead of per instance
+_FIELD_REQUIREMENTS = {
+    "machine_id": {"type": "string"},
+    "runtime_hours": {"type": "positive_integer"},
+    "vibration_level": {"type": "positive_number"},
+    "temperature": {"type": "range", "min": 0, "max": 200},
+    "maintenance_threshold": {"type": "range", "min": 0, "max": 100},
+    "max_operating_hours": {"type": "positive_integer"},
+    "scaling_factor": {"type": "positive_number"}
+}
+_REQUIRED_FIELDS = tuple(_FIELD_REQUIREMENTS)
+
+# Precompiled numeric prechecks; a cheap regex scan replaces the
+# try/except ValueError machinery around int()/float()
+_INT_RE = re.compile(r'^[+-]?\d+$')
+_NUM_RE = re.compile(r'^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+
+
+def _build_validator(field: str, requirements: Dict):
+    """Build a validator closure for a single field, capturing its requirements."""
+    if requirements["type"] == "string":
+        def validator(value: str) -> Tuple[bool, Union[str, int, float]]:
+            return True, value
+
+    elif requirements["type"] == "positive_integer":
+        error = f"Invalid value for {field}: must be a positive integer"
+        is_int = _INT_RE.match
+
+        def validator(value: str) -> Tuple[bool, Union[str, int, float]]:
+            if not is_int(value):
+                return False, error
+            num_value = int(value)
+            if num_value <= 0:
+                return False, error
+            return True, num_value
+
+    elif requirements["type"] == "positive_number":
+        error = f"Invalid value for {field}: must be a positive number"
+        is_number = _NUM_RE.match
+
+        def validator(value: str) -> Tuple[bool, Union[str, int, float]]:
+            if not is_number(value):
+                return False, error
+            num_value = float(value)
+            if num_value <= 0:
+                return False, error
+            return True, num_value
+
+    elif requirements["type"] == "range":
+        minimum = requirements["min"]
+        maximum = requirements["max"]
+        number_error = f"Invalid value for {field}: must be a number"
+        range_error = f"Invalid value for {field}: must be between {minimum} and {maximum}"
+        is_number = _NUM_RE.match
+
+        def validator(value: str) -> Tuple[bool, Union[str, int, float]]:
+            if not is_number(value):
+                return False, number_error
+            num_value = float(value)
+            if num_value < minimum or num_value > maximum:
+                return False, range_error
+            return True, num_value
+
+    return validator
+
+
+# One validator closure per field so the row loop does not re-dispatch on
+# the requirement type for every cell
+_VALIDATORS = tuple((field, _build_validator(field, requirements))
+                    for field, requirements in _FIELD_REQUIREMENTS.items())
+
+# Numeric prechecks the msgspec fast path must pass first, so its acceptance
+# set matches the closure validators exactly; msgspec's lax mode would
+# otherwise coerce tokens the closures reject, such as "1e3" for an integer
+# field or "inf" for a positive number
+_MSGSPEC_PRECHECKS = tuple(
+    (field, _INT_RE.match if requirements["type"] == "positive_integer" else _NUM_RE.match)
+    for field, requirements in _FIELD_REQUIREMENTS.items()
+    if requirements["type"] != "string")
+
+
+# Status and recommendation labels indexed by the optimal mask (0 or 1),
+# so classification is a branchless table lookup
+_STATUS_TBL = ("Requires Maintenance", "Optimal")
+_RECOMMENDATION_TBL = ("Schedule maintenance promptly", "No immediate maintenance required")
+if np is not None:
+    _STATUS_ARR = np.array(_STATUS_TBL)
+    _RECOMMENDATION_ARR = np.array(_RECOMMENDATION_TBL)
+
+
+# Validated input stored column-wise (struct of arrays); each column is a
+# NumPy ndarray when NumPy is available, a plain list otherwise
+@dataclass
+class MachineColumns:
+    machine_id: List[str]
+    runtime_hours: Union[List[int], "np.ndarray"]
+    vibration_level: Union[List[float], "np.ndarray"]
+    temperature: Union[List[float], "np.ndarray"]
+    maintenance_threshold: Union[List[float], "np.ndarray"]
+    max_operating_hours: Union[List[int], "np.ndarray"]
+    scaling_factor: Union[List[float], "np.ndarray"]
+
+    _NUMERIC_FIELDS = ("runtime_hours", "vibration_level", "temperature",
+                       "maintenance_threshold", "max_operating_hours", "scaling_factor")
+
+    def __len__(self) -> int:
+        return len(self.machine_id)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List]) -> "MachineColumns":
+        if np is not None:
+            columns = dict(columns)
+            for field in cls._NUMERIC_FIELDS:
+                columns[field] = np.asarray(columns[field])
+        return cls(**columns)
+
+    def row(self, i: int) -> Dict:
+        """Materialize row i as a plain dict at the formatting boundary."""
+        record = {"machine_id": self.machine_id[i]}
+        for field in self._NUMERIC_FIELDS:
+            value = getattr(self, field)[i]
+            record[field] = value.item() if np is not None else value
+        return record
+
+
+# Computed metrics stored column-wise, one array per metric plus the
+# boolean mask that drives the final recommendation
+@dataclass
+class MetricColumns:
+    predicted_failure_risk: Union[List[float], "np.ndarray"]
+    maintenance_urgency_ratio: Union[List[float], "np.ndarray"]
+    operating_margin: Union[List[float], "np.ndarray"]
+    composite_score: Union[List[float], "np.ndarray"]
+    efficiency_ratio: Union[List[float], "np.ndarray"]
+    # Composite-score sub-steps, computed once so reports need not re-derive them
+    om30: Union[List[float], "np.ndarray"]
+    inv_mur: Union[List[float], "np.ndarray"]
+    inv_mur7: Union[List[float], "np.ndarray"]
+    optimal: Union[List[bool], "np.ndarray"]
+    status: Union[List[str], "np.ndarray"]
+    recommendation: Union[List[str], "np.ndarray"]
+
+    def __len__(self) -> int:
+        return len(self.optimal)
+
+    @staticmethod
+    def classify(optimal) -> Tuple:
+        """Look up status and recommendation labels from the optimal mask."""
+        if np is not None:
+            index = optimal.astype(np.uint8)
+            return _STATUS_ARR[index], _RECOMMENDATION_ARR[index]
+        return ([_STATUS_TBL[is_optimal] for is_optimal in optimal],
+                [_RECOMMENDATION_TBL[is_optimal] for is_optimal in optimal])
+
+    def row(self, i: int) -> Dict:
+        """Materialize row i as a plain dict at the formatting boundary."""
+        values = (self.predicted_failure_risk[i], self.maintenance_urgency_ratio[i],
+                  self.operating_margin[i], self.composite_score[i], self.efficiency_ratio[i],
+                  self.om30[i], self.inv_mur[i], self.inv_mur7[i])
+        if np is not None:
+            values = tuple(value.item() for value in values)
+        pfr, mur, om, cs, eff, om30, inv_mur, inv_mur7 = values
+
+        return {
+            "predicted_failure_risk": pfr,
+            "maintenance_urgency_ratio": mur,
+            "operating_margin": om,
+            "composite_score": cs,
+            "efficiency_ratio": eff,
+            "om30": om30,
+            "inv_mur": inv_mur,
+            "inv_mur7": inv_mur7,
+            "status": str(self.status[i]),
+            "recommendation": str(self.recommendation[i])
         }
-        self.required_fields = list(self.field_requirements.keys())
-        
+
+
+# Per-machine analysis block, formatted once per row instead of line by line.
+# Literal braces in the LaTeX formulas are doubled for str.format.
+_MACHINE_TMPL = """**Machine {machine_id}**
+
+### Input Data:
+- **Runtime Hours:** {runtime_hours}
+- **Vibration Level:** {vibration_level}
+- **Temperature:** {temperature}
+- **Maintenance Threshold (%):** {maintenance_threshold}
+- **Max Operating Hours:** {max_operating_hours}
+- **Scaling Factor:** {scaling_factor}
+
+### Detailed Calculations:
+1. **Predicted Failure Risk Calculation:**
+   - **Formula:** $$ \\text{{Predicted Failure Risk}} = \\text{{vibration_level}} \\times \\text{{scaling_factor}} $$
+   - **Steps:** Multiply vibration_level ({vibration_level}) by scaling_factor ({scaling_factor}).
+   - **Final Predicted Failure Risk:** {predicted_failure_risk}
+
+2. **Maintenance Urgency Ratio Calculation:**
+   - **Formula:** $$ \\text{{Maintenance Urgency Ratio}} = \\frac{{\\text{{Predicted Failure Risk}}}}{{\\text{{runtime_hours}}}} \\times 100 $$
+   - **Steps:** Divide Predicted Failure Risk ({predicted_failure_risk}) by runtime_hours ({runtime_hours}), then multiply by 100.
+   - **Final Maintenance Urgency Ratio:** {maintenance_urgency_ratio}%
+
+3. **Operating Margin Calculation:**
+   - **Formula:** $$ \\text{{Operating Margin}} = \\frac{{(\\text{{max_operating_hours}} - \\text{{runtime_hours}})}}{{\\text{{max_operating_hours}}}} \\times 100 $$
+   - **Steps:** Subtract runtime_hours ({runtime_hours}) from max_operating_hours ({max_operating_hours}), divide by max_operating_hours ({max_operating_hours}), then multiply by 100.
+   - **Final Operating Margin:** {operating_margin}%
+
+4. **Composite Maintenance Score Calculation:**
+   - **Formula:** $$ \\text{{Composite Score}} = (\\text{{Operating Margin}} \\times 0.3) + ((100 - \\text{{Maintenance Urgency Ratio}}) \\times 0.7) $$
+   - **Steps:** Multiply Operating Margin ({operating_margin}) by 0.3 = {om30}; subtract Maintenance Urgency Ratio ({maintenance_urgency_ratio}) from 100 = {inv_mur} and multiply by 0.7 = {inv_mur7}; then add both values.
+   - **Final Composite Score:** {composite_score}
+
+5. **Efficiency Ratio Calculation:**
+   - **Formula:** $$ \\text{{Efficiency Ratio}} = \\frac{{\\text{{runtime_hours}}}}{{\\text{{Predicted Failure Risk}}}} $$
+   - **Steps:** Divide runtime_hours ({runtime_hours}) by Predicted Failure Risk ({predicted_failure_risk}).
+   - **Final Efficiency Ratio:** {efficiency_ratio}
+
+### Final Recommendation:
+- **Composite Score:** {composite_score}
+- **Maintenance Urgency Ratio:** {maintenance_urgency_ratio}%
+- **Efficiency Ratio:** {efficiency_ratio}
+- **Status:** {status}
+- **Recommended Action:** {recommendation}
+
+"""
+
+
+class PredictiveMaintenanceETL:
+    # All schema state is immutable and shared across instances, so it lives
+    # at module level and instantiation allocates nothing
+    field_requirements = _FIELD_REQUIREMENTS
+    required_fields = _REQUIRED_FIELDS
+    _validators = _VALIDATORS
+
     def parse_csv_data(self, csv_data: str) -> List[Dict]:
         """Parse CSV data into a list of dictionaries."""
         try:
@@ -34,99 +361,204 @@ class PredictiveMaintenanceETL:
         except Exception as e:
             return f"ERROR: Invalid data format. Please provide data in CSV format. Details: {str(e)}"
     
-    def validate_data(self, records: List[Dict]) -> Tuple[bool, str, List[Dict]]:
-        """Validate the parsed CSV data against requirements."""
-        valid_records = []
-        errors = []
-        
+    def _parse_csv_polars(self, csv_data: str):
+        """Parse CSV data into a Polars DataFrame of string columns."""
+        try:
+            # Strip any leading/trailing whitespace and remove any potential BOM
+            csv_data = csv_data.strip()
+
+            # Parse CSV data in Rust; values are typed during validation
+            try:
+                # truncate_ragged_lines drops overflow cells the way
+                # csv.DictReader ignores its restkey; short rows already
+                # match, as both sides fill the missing fields with nulls
+                df = pl.read_csv(io.StringIO(csv_data), infer_schema_length=0,
+                                 truncate_ragged_lines=True)
+            except pl.exceptions.NoDataError:
+                # Report empty input the same way as the csv.DictReader path
+                raise ValueError("No data found in the CSV input")
+
+            # Check if any records were parsed
+            if df.height == 0:
+                raise ValueError("No data found in the CSV input")
+
+            return df
+        except Exception as e:
+            return f"ERROR: Invalid data format. Please provide data in CSV format. Details: {str(e)}"
+
+    def _validate_data_polars(self, df) -> Tuple[bool, str, Optional[MachineColumns]]:
+        """Validate a Polars DataFrame with vectorized column expressions."""
         # Check for required fields in header
-        first_record = records[0]
-        missing_fields = [field for field in self.required_fields if field not in first_record]
+        missing_fields = [field for field in self.required_fields if field not in df.columns]
+        if missing_fields:
+            return False, f"ERROR: Missing required field(s): {', '.join(missing_fields)} in header.", None
+
+        df = df.with_columns(pl.col(self.required_fields).str.strip_chars())
+
+        # Build one error-string column per field; null means the cell is valid
+        error_exprs = []
+        cast_exprs = []
+        for field in self.required_fields:
+            requirements = self.field_requirements[field]
+            value = pl.col(field)
+            missing = value.is_null() | (value.str.len_chars() == 0)
+
+            if requirements["type"] == "string":
+                error = pl.when(missing).then(pl.lit(f"Missing required field: {field}")).otherwise(None)
+
+            elif requirements["type"] == "positive_integer":
+                number = value.cast(pl.Int64, strict=False)
+                error = (pl.when(missing)
+                         .then(pl.lit(f"Missing required field: {field}"))
+                         .when(number.is_null() | (number <= 0))
+                         .then(pl.lit(f"Invalid value for {field}: must be a positive integer"))
+                         .otherwise(None))
+                cast_exprs.append(number)
+
+            elif requirements["type"] == "positive_number":
+                # The grammar check keeps acceptance identical to the closure
+                # validators; the cast alone would let "inf" and "nan" through
+                number = value.cast(pl.Float64, strict=False)
+                malformed = value.str.contains(_NUM_RE.pattern).not_()
+                error = (pl.when(missing)
+                         .then(pl.lit(f"Missing required field: {field}"))
+                         .when(number.is_null() | malformed | (number <= 0))
+                         .then(pl.lit(f"Invalid value for {field}: must be a positive number"))
+                         .otherwise(None))
+                cast_exprs.append(number)
+
+            elif requirements["type"] == "range":
+                number = value.cast(pl.Float64, strict=False)
+                malformed = value.str.contains(_NUM_RE.pattern).not_()
+                error = (pl.when(missing)
+                         .then(pl.lit(f"Missing required field: {field}"))
+                         .when(number.is_null() | malformed)
+                         .then(pl.lit(f"Invalid value for {field}: must be a number"))
+                         .when((number < requirements["min"]) | (number > requirements["max"]))
+                         .then(pl.lit(f"Invalid value for {field}: must be between {requirements['min']} and {requirements['max']}"))
+                         .otherwise(None))
+                cast_exprs.append(number)
+
+            error_exprs.append(error.alias(field))
+
+        # Collect per-row error lists and report them with 1-based row numbers
+        row_errors = df.select(error_exprs).select(
+            pl.concat_list(pl.all()).list.drop_nulls()
+        ).to_series().to_list()
+
+        errors = [f"Row {i}: {', '.join(errs)}"
+                  for i, errs in enumerate(row_errors, 1) if errs]
+        if errors:
+            return False, "\n".join(errors), None
+
+        # Apply the numeric casts and hand typed columns to the compute stage
+        typed = df.with_columns(cast_exprs)
+        if np is not None:
+            numeric = {field: typed[field].to_numpy() for field in MachineColumns._NUMERIC_FIELDS}
+        else:
+            numeric = {field: typed[field].to_list() for field in MachineColumns._NUMERIC_FIELDS}
+
+        return True, "", MachineColumns(machine_id=typed["machine_id"].to_list(), **numeric)
+
+    def validate_data(self, records: Iterable[Dict]) -> Tuple[bool, str, Optional[MachineColumns]]:
+        """Validate parsed CSV records against requirements, consuming them lazily."""
+        # Hoist the attribute lookups and bound methods the row loop touches
+        # into locals; each read inside the loop is then a LOAD_FAST
+        required_fields = self.required_fields
+        validators = self._validators
+        columns = {field: [] for field in required_fields}
+        column_appends = tuple((field, columns[field].append) for field in required_fields)
+        errors = []
+        append_error = errors.append
+
+        # Check for required fields in header without materializing the stream
+        records = iter(records)
+        first_record = next(records)
+        missing_fields = [field for field in required_fields if field not in first_record]
         if missing_fields:
-            return False, f"ERROR: Missing required field(s): {', '.join(missing_fields)} in header.", []
-        
+            return False, f"ERROR: Missing required field(s): {', '.join(missing_fields)} in header.", None
+
         # Validate each record
-        for i, record in enumerate(records, 1):
+        for i, record in enumerate(itertools.chain([first_record], records), 1):
+            # Strip every cell once instead of twice per access in the loop.
+            # Only the required fields are normalized: csv.DictReader stores
+            # any overflow cells from a ragged row as a list under its None
+            # restkey, which str.strip would choke on and the loop never reads
+            record = {field: (record[field].strip() if record[field] else record[field])
+                      for field in required_fields}
+
+            # Fast path: validate and coerce the whole row in C. The regex
+            # prechecks keep the accepted numeric grammar identical to the
+            # closure validators; any row that fails a precheck or the
+            # conversion falls through to the closures for error messages
+            if msgspec is not None:
+                for field, matches in _MSGSPEC_PRECHECKS:
+                    value = record[field]
+                    if not value or not matches(value):
+                        break
+                else:
+                    try:
+                        row = msgspec.convert(record, MachineRow, strict=False)
+                    except msgspec.ValidationError:
+                        pass
+                    else:
+                        for field, append in column_appends:
+                            append(getattr(row, field))
+                        continue
+
             row_errors = []
             valid_record = {}
-            
-            # Check for missing fields
-            for field in self.required_fields:
-                if field not in record or record[field].strip() == '':
+
+            # Check for missing values and validate them; rows share the
+            # header's key set, so after the header check plain indexing is
+            # safe and no per-cell membership test is needed
+            for field, validator in validators:
+                value = record[field]
+                if not value:
                     row_errors.append(f"Missing required field: {field}")
                     continue
-                
-                # Validate field values
-                value = record[field].strip()
-                requirements = self.field_requirements[field]
-                
-                if requirements["type"] == "string":
-                    valid_record[field] = value
-                    
-                elif requirements["type"] == "positive_integer":
-                    try:
-                        num_value = int(value)
-                        if num_value <= 0:
-                            row_errors.append(f"Invalid value for {field}: must be a positive integer")
-                        else:
-                            valid_record[field] = num_value
-                    except ValueError:
-                        row_errors.append(f"Invalid value for {field}: must be a positive integer")
-                        
-                elif requirements["type"] == "positive_number":
-                    try:
-                        num_value = float(value)
-                        if num_value <= 0:
-                            row_errors.append(f"Invalid value for {field}: must be a positive number")
-                        else:
-                            valid_record[field] = num_value
-                    except ValueError:
-                        row_errors.append(f"Invalid value for {field}: must be a positive number")
-                        
-                elif requirements["type"] == "range":
-                    try:
-                        num_value = float(value)
-                        if num_value < requirements["min"] or num_value > requirements["max"]:
-                            row_errors.append(f"Invalid value for {field}: must be between {requirements['min']} and {requirements['max']}")
-                        else:
-                            valid_record[field] = num_value
-                    except ValueError:
-                        row_errors.append(f"Invalid value for {field}: must be a number")
+
+                is_ok, result = validator(value)
+                if is_ok:
+                    valid_record[field] = result
+                else:
+                    row_errors.append(result)
             
             if row_errors:
-                errors.append(f"Row {i}: {', '.join(row_errors)}")
+                append_error(f"Row {i}: {', '.join(row_errors)}")
             else:
-                valid_records.append(valid_record)
-        
+                for field, append in column_appends:
+                    append(valid_record[field])
+
         if errors:
-            return False, "\n".join(errors), []
-        
-        return True, "", valid_records
+            return False, "\n".join(errors), None
+
+        return True, "", MachineColumns.from_columns(columns)
     
-    def generate_validation_report(self, is_valid: bool, records: List[Dict], error_message: str = "") -> str:
+    def generate_validation_report(self, is_valid: bool, columns: Optional[MachineColumns], error_message: str = "") -> str:
         """Generate a data validation report in markdown format."""
-        report = "# Data Validation Report\n"
-        
-        if records:
-            report += "## Data Structure Check:\n"
-            report += f"- Number of machines: {len(records)}\n"
-            report += f"- Number of fields per record: {len(self.required_fields)}\n\n"
-            
-            report += "## Required Fields Check:\n"
+        parts = ["# Data Validation Report\n"]
+
+        if columns:
+            parts.append("## Data Structure Check:\n")
+            parts.append(f"- Number of machines: {len(columns)}\n")
+            parts.append(f"- Number of fields per record: {len(self.required_fields)}\n\n")
+
+            parts.append("## Required Fields Check:\n")
             for field in self.required_fields:
-                status = "present" if field in records[0] else "missing"
-                report += f"- {field}: {status}\n"
-            
-            report += "\n## Validation Summary:\n"
+                # Validation only succeeds with every required column populated
+                parts.append(f"- {field}: present\n")
+
+            parts.append("\n## Validation Summary:\n")
             if is_valid:
-                report += "Data validation is successful! Would you like to proceed with analysis or provide another dataset?"
+                parts.append("Data validation is successful! Would you like to proceed with analysis or provide another dataset?")
             else:
-                report += f"Validation failed with the following errors:\n```\n{error_message}\n```"
+                parts.append(f"Validation failed with the following errors:\n```\n{error_message}\n```")
         else:
-            report += "## Validation Summary:\n"
-            report += f"Validation failed with the following errors:\n```\n{error_message}\n```"
-        
-        return report
+            parts.append("## Validation Summary:\n")
+            parts.append(f"Validation failed with the following errors:\n```\n{error_message}\n```")
+
+        return "".join(parts)
     
     def calculate_metrics(self, record: Dict) -> Dict:
         """Calculate all required metrics for a machine record."""
@@ -136,138 +568,272 @@ class PredictiveMaintenanceETL:
         runtime_hours = record["runtime_hours"]
         max_operating_hours = record["max_operating_hours"]
         maintenance_threshold = record["maintenance_threshold"]
-        
-        # Calculate Predicted Failure Risk
-        predicted_failure_risk = vibration_level * scaling_factor
-        predicted_failure_risk = round(predicted_failure_risk, 2)
-        
-        # Calculate Maintenance Urgency Ratio
-        maintenance_urgency_ratio = (predicted_failure_risk / runtime_hours) * 100
-        maintenance_urgency_ratio = round(maintenance_urgency_ratio, 2)
-        
-        # Calculate Operating Margin
-        operating_margin = ((max_operating_hours - runtime_hours) / max_operating_hours) * 100
-        operating_margin = round(operating_margin, 2)
-        
-        # Calculate Composite Maintenance Score
-        composite_score = (operating_margin * 0.3) + ((100 - maintenance_urgency_ratio) * 0.7)
-        composite_score = round(composite_score, 2)
-        
-        # Calculate Efficiency Ratio
-        efficiency_ratio = runtime_hours / predicted_failure_risk
-        efficiency_ratio = round(efficiency_ratio, 2)
-        
+
+        # Compute each metric once on the unrounded values; rounding happens
+        # only at the emit boundary so no rounding error propagates downstream
+        _pfr = vibration_level * scaling_factor
+        _mur = (_pfr / runtime_hours) * 100
+        _om = ((max_operating_hours - runtime_hours) / max_operating_hours) * 100
+        _cs = (_om * 0.3) + ((100 - _mur) * 0.7)
+        _eff = runtime_hours / _pfr
+
+        predicted_failure_risk = round(_pfr, 2)
+        maintenance_urgency_ratio = round(_mur, 2)
+        operating_margin = round(_om, 2)
+        composite_score = round(_cs, 2)
+        efficiency_ratio = round(_eff, 2)
+
         # Determine final recommendation
         is_efficient = 0.90 <= efficiency_ratio <= 9.90
         is_urgent = maintenance_urgency_ratio > maintenance_threshold
-        
+
         if composite_score >= 75 and is_efficient and not is_urgent:
             status = "Optimal"
             recommendation = "No immediate maintenance required"
         else:
             status = "Requires Maintenance"
             recommendation = "Schedule maintenance promptly"
-        
+
         return {
             "predicted_failure_risk": predicted_failure_risk,
             "maintenance_urgency_ratio": maintenance_urgency_ratio,
             "operating_margin": operating_margin,
             "composite_score": composite_score,
             "efficiency_ratio": efficiency_ratio,
+            # Composite-score sub-steps, computed here so the report does not
+            # re-derive them per row
+            "om30": round(operating_margin * 0.3, 2),
+            "inv_mur": round(100 - maintenance_urgency_ratio, 2),
+            "inv_mur7": round((100 - maintenance_urgency_ratio) * 0.7, 2),
             "status": status,
             "recommendation": recommendation
         }
     
-    def generate_analysis_report(self, records: List[Dict], calculations: List[Dict]) -> str:
+    def calculate_metrics_bulk(self, columns: MachineColumns) -> MetricColumns:
+        """Calculate metrics for all machine records at once using NumPy vector operations."""
+        if np is None:
+            # Fall back to the per-row calculation when NumPy is unavailable
+            calculations = [self.calculate_metrics(columns.row(i)) for i in range(len(columns))]
+            optimal = [calc["status"] == "Optimal" for calc in calculations]
+            status, recommendation = MetricColumns.classify(optimal)
+            return MetricColumns(
+                predicted_failure_risk=[calc["predicted_failure_risk"] for calc in calculations],
+                maintenance_urgency_ratio=[calc["maintenance_urgency_ratio"] for calc in calculations],
+                operating_margin=[calc["operating_margin"] for calc in calculations],
+                composite_score=[calc["composite_score"] for calc in calculations],
+                efficiency_ratio=[calc["efficiency_ratio"] for calc in calculations],
+                om30=[calc["om30"] for calc in calculations],
+                inv_mur=[calc["inv_mur"] for calc in calculations],
+                inv_mur7=[calc["inv_mur7"] for calc in calculations],
+                optimal=optimal,
+                status=status,
+                recommendation=recommendation
+            )
+
+        # The validated columns are already contiguous arrays
+        vib = columns.vibration_level
+        sf = columns.scaling_factor
+        rt = columns.runtime_hours
+        mx = columns.max_operating_hours
+        thr = columns.maintenance_threshold
+
+        if _compute_metrics_ext is not None or _metric_kernel is not None:
+            # Compiled fused loop (AOT Cython extension if built, Numba JIT
+            # otherwise); preallocate the outputs once
+            n = len(columns)
+            pfr = np.empty(n)
+            mur = np.empty(n)
+            om = np.empty(n)
+            cs = np.empty(n)
+            eff = np.empty(n)
+            inputs = (vib.astype(np.float64), sf.astype(np.float64),
+                      rt.astype(np.float64), mx.astype(np.float64),
+                      thr.astype(np.float64))
+            if _compute_metrics_ext is not None:
+                flags = np.empty(n, dtype=np.uint8)
+                _compute_metrics_ext(*inputs, pfr, mur, om, cs, eff, flags)
+                optimal = flags.view(np.bool_)
+            else:
+                optimal = np.empty(n, dtype=np.bool_)
+                _metric_kernel(*inputs, pfr, mur, om, cs, eff, optimal)
+        else:
+            stacked = (vib, sf, rt, mx, thr)
+            workers = os.cpu_count() or 1
+            if len(columns) > _PARALLEL_THRESHOLD and workers > 1:
+                # Rows are independent, so split the columns into one chunk
+                # per core and farm them out to a process pool
+                chunk_args = list(zip(*(np.array_split(col, workers) for col in stacked)))
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_compute_metrics_numpy, chunk_args))
+                out = np.concatenate([chunk_out for chunk_out, _ in results], axis=1)
+                optimal = np.concatenate([chunk_optimal for _, chunk_optimal in results])
+            else:
+                out, optimal = _compute_metrics_numpy(stacked)
+
+            pfr, mur, om, cs, eff = out
+
+        # Composite-score sub-steps, derived once here from the rounded
+        # display values instead of per row in the report
+        om30 = np.round(om * 0.3, 2)
+        inv_mur = np.round(100 - mur, 2)
+        inv_mur7 = np.round((100 - mur) * 0.7, 2)
+
+        status, recommendation = MetricColumns.classify(optimal)
+
+        return MetricColumns(
+            predicted_failure_risk=pfr,
+            maintenance_urgency_ratio=mur,
+            operating_margin=om,
+            composite_score=cs,
+            efficiency_ratio=eff,
+            om30=om30,
+            inv_mur=inv_mur,
+            inv_mur7=inv_mur7,
+            optimal=optimal,
+            status=status,
+            recommendation=recommendation
+        )
+
+    def iter_analysis_report(self, columns: MachineColumns, metrics: MetricColumns) -> Iterator[str]:
+        """Yield the analysis report lazily as per-machine markdown chunks."""
+        n = len(columns)
+
+        yield f"# Predictive Maintenance Analysis Summary:\n"
+        yield f"- **Total Machines Evaluated:** {n}\n\n"
+
+        yield "## Detailed Analysis per Machine:\n"
+
+        # Alias every column into a local once; the loop body then indexes
+        # plain lists instead of hashing dict keys for each of the 14 fields
+        machine_ids = columns.machine_id
+        runtime_hours = columns.runtime_hours
+        vibration_levels = columns.vibration_level
+        temperatures = columns.temperature
+        thresholds = columns.maintenance_threshold
+        max_hours = columns.max_operating_hours
+        scaling_factors = columns.scaling_factor
+        risks = metrics.predicted_failure_risk
+        urgencies = metrics.maintenance_urgency_ratio
+        margins = metrics.operating_margin
+        scores = metrics.composite_score
+        efficiencies = metrics.efficiency_ratio
+        om30s = metrics.om30
+        inv_murs = metrics.inv_mur
+        inv_mur7s = metrics.inv_mur7
+        statuses = metrics.status
+        recommendations = metrics.recommendation
+        if np is not None:
+            # One bulk conversion to Python scalars instead of .item() per cell
+            runtime_hours = runtime_hours.tolist()
+            vibration_levels = vibration_levels.tolist()
+            temperatures = temperatures.tolist()
+            thresholds = thresholds.tolist()
+            max_hours = max_hours.tolist()
+            scaling_factors = scaling_factors.tolist()
+            risks = risks.tolist()
+            urgencies = urgencies.tolist()
+            margins = margins.tolist()
+            scores = scores.tolist()
+            efficiencies = efficiencies.tolist()
+            om30s = om30s.tolist()
+            inv_murs = inv_murs.tolist()
+            inv_mur7s = inv_mur7s.tolist()
+            statuses = statuses.tolist()
+            recommendations = recommendations.tolist()
+        fmt = _MACHINE_TMPL.format
+
+        for i in range(n):
+            yield fmt(
+                machine_id=machine_ids[i],
+                runtime_hours=runtime_hours[i],
+                vibration_level=vibration_levels[i],
+                temperature=temperatures[i],
+                maintenance_threshold=thresholds[i],
+                max_operating_hours=max_hours[i],
+                scaling_factor=scaling_factors[i],
+                predicted_failure_risk=risks[i],
+                maintenance_urgency_ratio=urgencies[i],
+                operating_margin=margins[i],
+                composite_score=scores[i],
+                efficiency_ratio=efficiencies[i],
+                status=statuses[i],
+                recommendation=recommendations[i],
+                om30=om30s[i], inv_mur=inv_murs[i], inv_mur7=inv_mur7s[i])
+
+            if i < n - 1:
+                yield "---\n\n"
+
+    def generate_analysis_report(self, columns: MachineColumns, metrics: MetricColumns) -> str:
         """Generate a detailed analysis report in markdown format."""
-        report = f"# Predictive Maintenance Analysis Summary:\n"
-        report += f"- **Total Machines Evaluated:** {len(records)}\n\n"
-        
-        report += "## Detailed Analysis per Machine:\n"
-        
-        for i, (record, calc) in enumerate(zip(records, calculations)):
-            report += f"**Machine {record['machine_id']}**\n\n"
-            
-            report += "### Input Data:\n"
-            report += f"- **Runtime Hours:** {record['runtime_hours']}\n"
-            report += f"- **Vibration Level:** {record['vibration_level']}\n"
-            report += f"- **Temperature:** {record['temperature']}\n"
-            report += f"- **Maintenance Threshold (%):** {record['maintenance_threshold']}\n"
-            report += f"- **Max Operating Hours:** {record['max_operating_hours']}\n"
-            report += f"- **Scaling Factor:** {record['scaling_factor']}\n\n"
-            
-            report += "### Detailed Calculations:\n"
-            
-            # 1. Predicted Failure Risk
-            report += "1. **Predicted Failure Risk Calculation:**\n"
-            report += "   - **Formula:** $$ \\text{Predicted Failure Risk} = \\text{vibration_level} \\times \\text{scaling_factor} $$\n"
-            report += f"   - **Steps:** Multiply vibration_level ({record['vibration_level']}) by scaling_factor ({record['scaling_factor']}).\n"
-            report += f"   - **Final Predicted Failure Risk:** {calc['predicted_failure_risk']}\n\n"
-            
-            # 2. Maintenance Urgency Ratio
-            report += "2. **Maintenance Urgency Ratio Calculation:**\n"
-            report += "   - **Formula:** $$ \\text{Maintenance Urgency Ratio} = \\frac{\\text{Predicted Failure Risk}}{\\text{runtime_hours}} \\times 100 $$\n"
-            report += f"   - **Steps:** Divide Predicted Failure Risk ({calc['predicted_failure_risk']}) by runtime_hours ({record['runtime_hours']}), then multiply by 100.\n"
-            report += f"   - **Final Maintenance Urgency Ratio:** {calc['maintenance_urgency_ratio']}%\n\n"
-            
-            # 3. Operating Margin
-            report += "3. **Operating Margin Calculation:**\n"
-            report += "   - **Formula:** $$ \\text{Operating Margin} = \\frac{(\\text{max_operating_hours} - \\text{runtime_hours})}{\\text{max_operating_hours}} \\times 100 $$\n"
-            report += f"   - **Steps:** Subtract runtime_hours ({record['runtime_hours']}) from max_operating_hours ({record['max_operating_hours']}), divide by max_operating_hours ({record['max_operating_hours']}), then multiply by 100.\n"
-            report += f"   - **Final Operating Margin:** {calc['operating_margin']}%\n\n"
-            
-            # 4. Composite Maintenance Score
-            report += "4. **Composite Maintenance Score Calculation:**\n"
-            report += "   - **Formula:** $$ \\text{Composite Score} = (\\text{Operating Margin} \\times 0.3) + ((100 - \\text{Maintenance Urgency Ratio}) \\times 0.7) $$\n"
-            report += f"   - **Steps:** Multiply Operating Margin ({calc['operating_margin']}) by 0.3 = {round(calc['operating_margin'] * 0.3, 2)}; subtract Maintenance Urgency Ratio ({calc['maintenance_urgency_ratio']}) from 100 = {round(100 - calc['maintenance_urgency_ratio'], 2)} and multiply by 0.7 = {round((100 - calc['maintenance_urgency_ratio']) * 0.7, 2)}; then add both values.\n"
-            report += f"   - **Final Composite Score:** {calc['composite_score']}\n\n"
-            
-            # 5. Efficiency Ratio
-            report += "5. **Efficiency Ratio Calculation:**\n"
-            report += "   - **Formula:** $$ \\text{Efficiency Ratio} = \\frac{\\text{runtime_hours}}{\\text{Predicted Failure Risk}} $$\n"
-            report += f"   - **Steps:** Divide runtime_hours ({record['runtime_hours']}) by Predicted Failure Risk ({calc['predicted_failure_risk']}).\n"
-            report += f"   - **Final Efficiency Ratio:** {calc['efficiency_ratio']}\n\n"
-            
-            # Final Recommendation
-            report += "### Final Recommendation:\n"
-            report += f"- **Composite Score:** {calc['composite_score']}\n"
-            report += f"- **Maintenance Urgency Ratio:** {calc['maintenance_urgency_ratio']}%\n"
-            report += f"- **Efficiency Ratio:** {calc['efficiency_ratio']}\n"
-            report += f"- **Status:** {calc['status']}\n"
-            report += f"- **Recommended Action:** {calc['recommendation']}\n\n"
-            
-            if i < len(records) - 1:
-                report += "---\n\n"
-        
-        return report
+        return "".join(self.iter_analysis_report(columns, metrics))
     
+    def _parse_and_validate(self, csv_data: str) -> Union[str, Tuple[bool, str, Optional[MachineColumns]]]:
+        """Parse and validate CSV data, preferring the Polars fast path.
+
+        Returns a raw error string when parsing fails, otherwise the
+        (is_valid, error_message, columns) validation result.
+        """
+        if pl is not None:
+            df = self._parse_csv_polars(csv_data)
+
+            # Check if parsing returned an error
+            if isinstance(df, str):
+                return df
+
+            return self._validate_data_polars(df)
+
+        # Stream rows straight from the reader into validation instead of
+        # materializing the full record list first
+        csv_reader = csv.DictReader(io.StringIO(csv_data.strip()))
+        first_record = next(csv_reader, None)
+        if first_record is None:
+            return "ERROR: Invalid data format. Please provide data in CSV format. Details: No data found in the CSV input"
+
+        return self.validate_data(itertools.chain([first_record], csv_reader))
+
     def process_csv_data(self, csv_data: str) -> str:
         """Process CSV data and generate appropriate reports."""
-        # Parse CSV data
-        records = self.parse_csv_data(csv_data)
-        
-        # Check if parsing returned an error
-        if isinstance(records, str):
-            return records
-        
-        # Validate data
-        is_valid, error_message, valid_records = self.validate_data(records)
-        
+        result = self._parse_and_validate(csv_data)
+        if isinstance(result, str):
+            return result
+        is_valid, error_message, columns = result
+
         # Generate validation report
-        validation_report = self.generate_validation_report(is_valid, valid_records, error_message)
-        
+        validation_report = self.generate_validation_report(is_valid, columns, error_message)
+
         # If validation failed, return only the validation report
         if not is_valid:
             return validation_report
-        
-        # Calculate metrics for each valid record
-        calculations = [self.calculate_metrics(record) for record in valid_records]
-        
+
+        # Calculate metrics for all valid records at once
+        metrics = self.calculate_metrics_bulk(columns)
+
         # Generate analysis report
-        analysis_report = self.generate_analysis_report(valid_records, calculations)
-        
+        analysis_report = self.generate_analysis_report(columns, metrics)
+
         return f"{validation_report}\n\n{analysis_report}"
 
+    def process_csv_data_stream(self, csv_data: str, out: TextIO) -> None:
+        """Process CSV data, writing the reports to out chunk by chunk.
+
+        Unlike process_csv_data, the analysis report is never materialized
+        as one string, so peak memory stays at one machine block.
+        """
+        result = self._parse_and_validate(csv_data)
+        if isinstance(result, str):
+            out.write(result)
+            return
+        is_valid, error_message, columns = result
+
+        out.write(self.generate_validation_report(is_valid, columns, error_message))
+        if not is_valid:
+            return
+
+        out.write("\n\n")
+        metrics = self.calculate_metrics_bulk(columns)
+        for chunk in self.iter_analysis_report(columns, metrics):
+            out.write(chunk)
+
 
 def main():
     """Main function with sample data."""
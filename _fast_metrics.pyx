@@ -0,0 +1,43 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""Ahead-of-time compiled metric kernel for CSV_ETL_PredictiveMaintenance-AI.
+
+Build in place with:
+
+    cythonize -i _fast_metrics.pyx
+
+The main module picks this extension up automatically when the built
+artifact is importable and falls back to Numba/NumPy otherwise.
+"""
+
+from libc.math cimport rint
+
+
+def compute_metrics(double[::1] vib, double[::1] sf, double[::1] rt,
+                    double[::1] mx, double[::1] thr,
+                    double[::1] pfr, double[::1] mur, double[::1] om,
+                    double[::1] cs, double[::1] eff,
+                    unsigned char[::1] optimal):
+    """Fill the output views with the five metrics and the status mask."""
+    cdef Py_ssize_t i, n = vib.shape[0]
+    cdef double p, m, o, c, e
+
+    for i in range(n):
+        # Metrics are computed on the unrounded values and rounded once for
+        # output, as rint(x * 100) / 100; rint rounds half-to-even,
+        # matching Python's round()
+        p = vib[i] * sf[i]
+        m = p / rt[i] * 100.0
+        o = (mx[i] - rt[i]) / mx[i] * 100.0
+        c = o * 0.3 + (100.0 - m) * 0.7
+        e = rt[i] / p
+
+        m = rint(m * 100.0) / 100.0
+        c = rint(c * 100.0) / 100.0
+        e = rint(e * 100.0) / 100.0
+
+        pfr[i] = rint(p * 100.0) / 100.0
+        mur[i] = m
+        om[i] = rint(o * 100.0) / 100.0
+        cs[i] = c
+        eff[i] = e
+        optimal[i] = c >= 75.0 and 0.90 <= e <= 9.90 and m <= thr[i]